@@ -1,9 +1,11 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-from .models import Invoice, ValidationResult, ValidationSummary
+from typing import List, Optional
+from .models import Invoice, ValidationResult, ValidationSummary, RoutingSummary, ExtractionLimits, BatchInfo, ResultPage
 from .validator import validate_all, validate_invoice
-from .extractor import extract_invoice
+from .worker import ExtractionWorker, MAX_DOCUMENTS_PER_WORKER, MAX_WORKER_RSS_MB
+from .classifier import record_route
+from .store import Batch, BatchStore, MAX_BATCHES, DEFAULT_PAGE_SIZE
 import shutil
 import os
 import tempfile
@@ -21,6 +23,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def env_number(name: str, cast, default=None):
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+# Extraction runs in a recycled child process so large or broken PDFs can't grow this process
+extraction_worker = ExtractionWorker(
+    limits=ExtractionLimits(
+        max_pages=env_number("INVOICE_QC_MAX_PAGES", int),
+        max_bytes=env_number("INVOICE_QC_MAX_BYTES", int),
+        max_rss_mb=env_number("INVOICE_QC_MAX_DOCUMENT_RSS_MB", float),
+    ),
+    max_documents=env_number("INVOICE_QC_WORKER_MAX_DOCUMENTS", int, MAX_DOCUMENTS_PER_WORKER),
+    max_rss_mb=env_number("INVOICE_QC_WORKER_MAX_RSS_MB", float, MAX_WORKER_RSS_MB),
+)
+
+# Batch results stay server-side; the console pages through them instead of receiving everything at once
+batch_store = BatchStore(max_batches=env_number("INVOICE_QC_MAX_BATCHES", int, MAX_BATCHES))
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="web"), name="static")
 
@@ -41,9 +61,10 @@ def validate_json(invoices: List[Invoice]):
         "results": results
     }
 
-@app.post("/extract-and-validate-pdfs")
-async def extract_and_validate_pdfs(files: List[UploadFile] = File(...)):
+def extract_uploads(files: List[UploadFile]):
     invoices = []
+    routing = RoutingSummary()
+    extraction_stats = []
     
     # Create a temp dir to save uploaded files
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -52,17 +73,67 @@ async def extract_and_validate_pdfs(files: List[UploadFile] = File(...)):
             with open(temp_path, "wb") as buffer:
                 shutil.copyfileobj(file.file, buffer)
             
-            try:
-                inv = extract_invoice(temp_path)
+            # Classification and extraction both run in the worker, so limits apply before any parsing here
+            doc, inv, stats = extraction_worker.process(temp_path)
+            doc.source = file.filename
+            stats.source = file.filename
+            record_route(routing, doc)
+            extraction_stats.append(stats)
+            if inv is not None:
                 invoices.append(inv)
-            except Exception as e:
-                # Handle error or skip
-                pass
-                
+
+    return invoices, routing, extraction_stats
+
+def get_batch_or_404(batch_id: str) -> Batch:
+    batch = batch_store.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    return batch
+
+# Upload endpoints are plain defs: FastAPI runs them in its threadpool, so waiting on the
+# worker doesn't block the event loop serving paginated reads and /health
+@app.post("/extract-and-validate-pdfs")
+def extract_and_validate_pdfs(files: List[UploadFile] = File(...)):
+    invoices, routing, extraction_stats = extract_uploads(files)
     results, summary = validate_all(invoices)
     
     return {
         "summary": summary,
         "results": results,
+        "routing": routing,
+        "extraction_stats": extraction_stats,
         "extracted_data": invoices
     }
+
+@app.post("/batches", response_model=BatchInfo)
+def create_batch(files: List[UploadFile] = File(...)):
+    invoices, routing, extraction_stats = extract_uploads(files)
+    results, summary = validate_all(invoices)
+    
+    batch = batch_store.add(Batch(invoices, results, summary, routing, extraction_stats))
+    return batch.info()
+
+@app.get("/batches/{batch_id}", response_model=BatchInfo)
+def get_batch(batch_id: str):
+    return get_batch_or_404(batch_id).info()
+
+@app.get("/batches/{batch_id}/results", response_model=ResultPage)
+def list_batch_results(
+    batch_id: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    is_valid: Optional[bool] = None,
+    error_code: Optional[str] = None,
+    seller: Optional[str] = None,
+):
+    batch = get_batch_or_404(batch_id)
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail=f"Invalid cursor {cursor}")
+    return batch.page(cursor=cursor, limit=limit, is_valid=is_valid, error_code=error_code, seller=seller)
+
+@app.get("/batches/{batch_id}/invoices/{index}/raw-text")
+def get_raw_text(batch_id: str, index: int):
+    batch = get_batch_or_404(batch_id)
+    if index < 0 or index >= len(batch.invoices):
+        raise HTTPException(status_code=404, detail=f"Invoice {index} not found in batch {batch_id}")
+    return {"index": index, "raw_text": batch.invoices[index].raw_text}
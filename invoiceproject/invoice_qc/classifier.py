@@ -0,0 +1,91 @@
+import pdfplumber
+import re
+from typing import List, Optional
+from .models import DocumentClassification, DocumentRoute, RoutingSummary
+
+# Fewer characters than this on the first page means there is no usable text layer (scan / image-only)
+MIN_TEXT_CHARS = 20
+
+# Keywords that mark a document as an invoice (or an order the extractor treats like one), per language
+INVOICE_MARKERS = {
+    "en": [r'invoice', r'bill\s*to', r'amount\s*due'],
+    "de": [r'rechnung', r'bestellung', r'gesamtwert', r'mwst\.'],
+}
+
+# Keywords for documents that look similar but should not be parsed as invoices
+NON_INVOICE_MARKERS = {
+    "en": [r'delivery\s*note', r'packing\s*(?:slip|list)', r'statement\s*of\s*account', r'account\s*statement', r'quotation'],
+    "de": [r'lieferschein', r'kontoauszug', r'angebot'],
+}
+
+def _first_match(patterns: List[str], text: str) -> Optional[int]:
+    # Position of the earliest hit, so the document title (usually near the top) wins ties
+    positions = [m.start() for p in patterns for m in [re.search(p, text)] if m]
+    return min(positions) if positions else None
+
+def classify_text(text: str) -> DocumentClassification:
+    """Classify a document from the text of its first page."""
+    result = DocumentClassification(has_text_layer=True, char_count=len(text))
+    lowered = text.lower()
+
+    scores = {}
+    for lang in INVOICE_MARKERS:
+        patterns = INVOICE_MARKERS[lang] + NON_INVOICE_MARKERS[lang]
+        scores[lang] = sum(1 for p in patterns if re.search(p, lowered))
+    if scores["de"] > scores["en"]:
+        result.language = "de"
+    elif scores["en"] > 0:
+        result.language = "en"
+
+    invoice_pos = _first_match([p for ps in INVOICE_MARKERS.values() for p in ps], lowered)
+    other_pos = _first_match([p for ps in NON_INVOICE_MARKERS.values() for p in ps], lowered)
+
+    if invoice_pos is None or (other_pos is not None and other_pos < invoice_pos):
+        result.route = DocumentRoute.NON_INVOICE
+    elif result.language == "de":
+        result.route = DocumentRoute.INVOICE_DE
+    else:
+        result.route = DocumentRoute.INVOICE_EN
+    return result
+
+def classify_pdf(pdf_path: str) -> DocumentClassification:
+    """Cheap pre-stage: look at the first page only and decide where the document should go."""
+    try:
+        return _classify_first_page(pdf_path)
+    except Exception as e:
+        # Corrupt or non-PDF files still get counted, in their own bucket
+        return DocumentClassification(source=pdf_path, route=DocumentRoute.UNREADABLE, error=f"{type(e).__name__}: {e}")
+
+def _classify_first_page(pdf_path: str) -> DocumentClassification:
+    # pages=[1] stops pdfplumber from building page objects for the rest of the document
+    with pdfplumber.open(pdf_path, pages=[1]) as pdf:
+        if not pdf.pages:
+            return DocumentClassification(source=pdf_path, route=DocumentRoute.NON_INVOICE)
+
+        page = pdf.pages[0]
+        # Counting chars avoids running layout analysis on scans
+        char_count = len(page.chars)
+        if char_count < MIN_TEXT_CHARS:
+            return DocumentClassification(source=pdf_path, route=DocumentRoute.NEEDS_OCR, char_count=char_count)
+
+        text = page.extract_text() or ""
+
+    result = classify_text(text)
+    result.source = pdf_path
+    result.char_count = char_count
+    return result
+
+def is_invoice(classification: DocumentClassification) -> bool:
+    return classification.route in (DocumentRoute.INVOICE_EN, DocumentRoute.INVOICE_DE)
+
+def record_route(summary: RoutingSummary, classification: DocumentClassification):
+    summary.total_documents += 1
+    route = classification.route.value
+    summary.route_counts[route] = summary.route_counts.get(route, 0) + 1
+
+    if classification.route == DocumentRoute.NON_INVOICE:
+        summary.rejected.append(classification.source)
+    elif classification.route == DocumentRoute.NEEDS_OCR:
+        summary.needs_ocr.append(classification.source)
+    elif classification.route == DocumentRoute.UNREADABLE:
+        summary.unreadable.append(f"{classification.source}: {classification.error}")
@@ -2,17 +2,23 @@ import typer
 import json
 from pathlib import Path
 from typing import Optional
-from .extractor import extract_invoices_from_dir, extract_invoice
+from .extractor import extract_invoices_with_routing, extract_invoice
 from .validator import validate_all
-from .models import Invoice
+from .models import Invoice, RoutingSummary
 
 app = typer.Typer()
 
+def echo_routing(routing: RoutingSummary):
+    typer.echo(f"Routing: {routing.total_documents} documents classified")
+    for route, count in sorted(routing.route_counts.items()):
+        typer.echo(f"  {route}: {count}")
+
 @app.command()
 def extract(pdf_dir: Path, output: Path):
     """Extract invoices from a directory of PDFs to a JSON file."""
     typer.echo(f"Extracting invoices from {pdf_dir}...")
-    invoices = extract_invoices_from_dir(str(pdf_dir))
+    invoices, routing = extract_invoices_with_routing(str(pdf_dir))
+    echo_routing(routing)
     
     # Convert to dicts for JSON serialization
     data = [inv.model_dump(mode='json') for inv in invoices]
@@ -55,14 +61,16 @@ def full_run(pdf_dir: Path, report: Path):
     """Extract and validate in one go."""
     typer.echo(f"Running full pipeline on {pdf_dir}...")
     
-    # Extract
-    invoices = extract_invoices_from_dir(str(pdf_dir))
+    # Extract (non-invoices and scans are routed away before the full parse)
+    invoices, routing = extract_invoices_with_routing(str(pdf_dir))
+    echo_routing(routing)
     
     # Validate
     results, summary = validate_all(invoices)
     
     report_data = {
         "summary": summary.model_dump(),
+        "routing": routing.model_dump(),
         "details": [res.model_dump() for res in results],
         "extracted_data": [inv.model_dump(mode='json') for inv in invoices]
     }
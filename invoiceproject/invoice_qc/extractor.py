@@ -1,15 +1,66 @@
 import pdfplumber
+import os
 import re
+import sys
 from typing import List, Optional
 from datetime import datetime
 from pathlib import Path
-from .models import Invoice, LineItem, Currency
+from .models import Invoice, LineItem, Currency, RoutingSummary, ExtractionLimits, ExtractionStats
+from .classifier import classify_pdf, is_invoice, record_route
+
+class DocumentLimitExceeded(Exception):
+    """Raised when a PDF is larger, longer or more memory hungry than the configured limits allow."""
+
+def current_rss_mb() -> float:
+    # /proc gives the current RSS on Linux; elsewhere fall back to the process peak
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KiB on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def sample_rss(stats: ExtractionStats, limits: Optional[ExtractionLimits] = None):
+    rss = current_rss_mb()
+    # Growth is measured from the start of the document, so a worker's baseline doesn't count against it
+    if stats.start_rss_mb is None:
+        stats.start_rss_mb = rss
+    stats.peak_rss_mb = max(stats.peak_rss_mb, rss)
+    stats.rss_growth_mb = stats.peak_rss_mb - stats.start_rss_mb
+
+    if limits is not None and limits.max_rss_mb is not None and stats.rss_growth_mb > limits.max_rss_mb:
+        raise DocumentLimitExceeded(f"{stats.source} grew RSS by {stats.rss_growth_mb:.0f} MB (limit {limits.max_rss_mb:.0f} MB)")
+
+def check_document_size(pdf_path: str, limits: ExtractionLimits, stats: ExtractionStats):
+    stats.source = pdf_path
+    stats.bytes = os.path.getsize(pdf_path)
+    if limits.max_bytes is not None and stats.bytes > limits.max_bytes:
+        raise DocumentLimitExceeded(f"{pdf_path} is {stats.bytes} bytes (limit {limits.max_bytes})")
+
+def extract_text_from_pdf(pdf_path: str, limits: Optional[ExtractionLimits] = None, stats: Optional[ExtractionStats] = None) -> str:
+    limits = limits or ExtractionLimits()
+    stats = stats if stats is not None else ExtractionStats()
+    sample_rss(stats)
+    check_document_size(pdf_path, limits, stats)
+
+    # Only build page objects up to one past the limit, enough to tell the document is too long
+    pages = range(1, limits.max_pages + 2) if limits.max_pages is not None else None
 
-def extract_text_from_pdf(pdf_path: str) -> str:
     text = ""
-    with pdfplumber.open(pdf_path) as pdf:
+    with pdfplumber.open(pdf_path, pages=pages) as pdf:
+        if limits.max_pages is not None and len(pdf.pages) > limits.max_pages:
+            raise DocumentLimitExceeded(f"{pdf_path} has more than {limits.max_pages} pages")
+
         for page in pdf.pages:
-            text += page.extract_text() + "\n"
+            # Image-only pages have no text layer and return None
+            text += (page.extract_text() or "") + "\n"
+            stats.pages += 1
+            # Sample before releasing the page so the high-water mark includes its layout data
+            sample_rss(stats, limits)
+            # pdfplumber keeps chars/layout cached on the page until the file is closed
+            page.close()
     return text
 
 def parse_date(date_str: str) -> Optional[datetime.date]:
@@ -36,16 +87,7 @@ def parse_currency(text: str) -> Optional[Currency]:
         return Currency.INR
     return None
 
-def extract_invoice(pdf_path: str) -> Invoice:
-    text = extract_text_from_pdf(pdf_path)
-    lines = text.split('\n')
-    
-    invoice = Invoice()
-    invoice.raw_text = text
-    
-    # Debug: Print first 500 chars to see what we are working with
-    print(f"--- Extracted Text for {pdf_path} ---\n{text[:500]}...\n--------------------------------")
-
+def parse_english_fields(invoice: Invoice, text: str, lines: List[str]):
     # Invoice Number
     # Patterns: "Invoice No:", "Invoice #", "Inv:", or just "Invoice" followed by a number
     inv_patterns = [
@@ -80,8 +122,6 @@ def extract_invoice(pdf_path: str) -> Invoice:
     # Parties
     # Heuristic: "Bill To:" or "To:" for Buyer
     bill_to_idx = -1
-    lines = [l.strip() for l in lines if l.strip()] # Clean empty lines
-    
     for i, line in enumerate(lines):
         if re.search(r'(?i)^(bill\s*to|to|buyer):?$', line):
             bill_to_idx = i
@@ -143,8 +183,9 @@ def extract_invoice(pdf_path: str) -> Invoice:
             except:
                 pass
 
+def parse_german_fields(invoice: Invoice, text: str, lines: List[str]):
     # --- GERMAN / SPECIFIC INVOICE SUPPORT ---
-    
+
     # Invoice Number (German: Bestellung / Auftrag / Rechnung)
     if not invoice.invoice_number:
         # "Bestellung AUFNR34343"
@@ -208,7 +249,26 @@ def extract_invoice(pdf_path: str) -> Invoice:
         # "ABC Corporation" is at the start
         invoice.seller_name = lines[0].strip()
 
-    # --- END GERMAN SUPPORT ---
+def extract_invoice(pdf_path: str, language: Optional[str] = None, limits: Optional[ExtractionLimits] = None, stats: Optional[ExtractionStats] = None) -> Invoice:
+    text = extract_text_from_pdf(pdf_path, limits=limits, stats=stats)
+    lines = text.split('\n')
+    
+    invoice = Invoice()
+    invoice.raw_text = text
+    
+    # Debug: Print first 500 chars to see what we are working with
+    print(f"--- Extracted Text for {pdf_path} ---\n{text[:500]}...\n--------------------------------")
+
+    lines = [l.strip() for l in lines if l.strip()] # Clean empty lines
+
+    # Only run the heuristics for the routed language; None (unclassified) runs both
+    if language != "de":
+        parse_english_fields(invoice, text, lines)
+    if language != "en":
+        parse_german_fields(invoice, text, lines)
+
+    # Clean text for amount search (remove currency symbols for easier regex)
+    clean_text = text.replace('$', '').replace('€', '').replace('£', '').replace('₹', '')
 
     # --- FALLBACKS ---
     
@@ -249,14 +309,26 @@ def extract_invoice(pdf_path: str) -> Invoice:
 
     return invoice
 
-def extract_invoices_from_dir(directory: str) -> List[Invoice]:
+def extract_invoices_with_routing(directory: str) -> tuple[List[Invoice], RoutingSummary]:
     invoices = []
+    routing = RoutingSummary()
     path = Path(directory)
     for pdf_file in path.glob("*.pdf"):
         try:
-            inv = extract_invoice(str(pdf_file))
+            # Cheap first-page pass decides whether the full parse is worth running
+            doc = classify_pdf(str(pdf_file))
+            record_route(routing, doc)
+            if not is_invoice(doc):
+                print(f"Skipping {pdf_file}: routed to {doc.route.value}")
+                continue
+
+            inv = extract_invoice(str(pdf_file), language=doc.language)
             invoices.append(inv)
         except Exception as e:
             print(f"Error extracting {pdf_file}: {e}")
             # Optionally add a partial invoice or log error
+    return invoices, routing
+
+def extract_invoices_from_dir(directory: str) -> List[Invoice]:
+    invoices, _ = extract_invoices_with_routing(directory)
     return invoices
@@ -48,3 +48,58 @@ class ValidationSummary(BaseModel):
     valid_invoices: int = 0
     invalid_invoices: int = 0
     error_counts: dict[str, int] = Field(default_factory=dict)
+
+class DocumentRoute(str, Enum):
+    INVOICE_EN = "invoice_en"
+    INVOICE_DE = "invoice_de"
+    NON_INVOICE = "non_invoice"
+    NEEDS_OCR = "needs_ocr"
+    UNREADABLE = "unreadable"
+
+class DocumentClassification(BaseModel):
+    source: Optional[str] = None
+    route: DocumentRoute = DocumentRoute.NON_INVOICE
+    language: Optional[str] = None
+    has_text_layer: bool = False
+    char_count: int = 0
+    error: Optional[str] = None
+
+class RoutingSummary(BaseModel):
+    total_documents: int = 0
+    route_counts: dict[str, int] = Field(default_factory=dict)
+    rejected: List[str] = Field(default_factory=list)
+    needs_ocr: List[str] = Field(default_factory=list)
+    unreadable: List[str] = Field(default_factory=list) # "<source>: <error>"
+
+class ExtractionLimits(BaseModel):
+    max_pages: Optional[int] = None
+    max_bytes: Optional[int] = None
+    # Abort a document if it grows the process RSS by more than this
+    max_rss_mb: Optional[float] = None
+
+class ExtractionStats(BaseModel):
+    source: Optional[str] = None
+    pages: int = 0
+    bytes: int = 0
+    start_rss_mb: Optional[float] = None
+    peak_rss_mb: float = 0.0
+    rss_growth_mb: float = 0.0 # peak_rss_mb - start_rss_mb
+    worker_pid: Optional[int] = None
+    error: Optional[str] = None
+
+class BatchInfo(BaseModel):
+    batch_id: str
+    summary: ValidationSummary
+    routing: RoutingSummary = Field(default_factory=RoutingSummary)
+    extraction_stats: List[ExtractionStats] = Field(default_factory=list)
+
+class ResultRow(BaseModel):
+    index: int
+    result: ValidationResult
+    invoice: dict # Extracted fields without raw_text
+
+class ResultPage(BaseModel):
+    batch_id: str
+    items: List[ResultRow] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total_matching: int = 0
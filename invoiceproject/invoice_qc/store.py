@@ -0,0 +1,77 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+from .models import Invoice, ValidationResult, ValidationSummary, RoutingSummary, ExtractionStats, BatchInfo, ResultRow, ResultPage
+
+MAX_BATCHES = 20
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class Batch:
+    def __init__(self, invoices: List[Invoice], results: List[ValidationResult], summary: ValidationSummary,
+                 routing: Optional[RoutingSummary] = None, extraction_stats: Optional[List[ExtractionStats]] = None):
+        self.batch_id = uuid.uuid4().hex
+        self.invoices = invoices
+        self.results = results
+        self.summary = summary
+        self.routing = routing or RoutingSummary()
+        self.extraction_stats = extraction_stats or []
+
+    def info(self) -> BatchInfo:
+        return BatchInfo(
+            batch_id=self.batch_id,
+            summary=self.summary,
+            routing=self.routing,
+            extraction_stats=self.extraction_stats,
+        )
+
+    def row(self, index: int) -> ResultRow:
+        # raw_text is the bulk of the payload, so rows leave it out and it is fetched per invoice
+        invoice = self.invoices[index].model_dump(mode='json', exclude={'raw_text'})
+        return ResultRow(index=index, result=self.results[index], invoice=invoice)
+
+    def matches(self, index: int, is_valid: Optional[bool], error_code: Optional[str], seller: Optional[str]) -> bool:
+        res = self.results[index]
+        if is_valid is not None and res.is_valid != is_valid:
+            return False
+        # Prefix match, so "missing_field" and "missing_field: buyer_name" both work
+        if error_code and not any(e.startswith(error_code) for e in res.errors):
+            return False
+        if seller:
+            seller_name = self.invoices[index].seller_name or ""
+            if seller.lower() not in seller_name.lower():
+                return False
+        return True
+
+    def page(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, is_valid: Optional[bool] = None,
+             error_code: Optional[str] = None, seller: Optional[str] = None) -> ResultPage:
+        """Return up to `limit` matching rows starting at `cursor` (the index to resume scanning from)."""
+        start = int(cursor) if cursor else 0
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        matching = [i for i in range(len(self.results)) if self.matches(i, is_valid, error_code, seller)]
+        remaining = [i for i in matching if i >= start]
+        items = [self.row(i) for i in remaining[:limit]]
+        next_cursor = str(remaining[limit]) if len(remaining) > limit else None
+
+        return ResultPage(batch_id=self.batch_id, items=items, next_cursor=next_cursor, total_matching=len(matching))
+
+class BatchStore:
+    """Keeps the most recent batches in memory so clients can page through them."""
+
+    def __init__(self, max_batches: int = MAX_BATCHES):
+        self.max_batches = max_batches
+        self._batches = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, batch: Batch) -> Batch:
+        with self._lock:
+            self._batches[batch.batch_id] = batch
+            while len(self._batches) > self.max_batches:
+                self._batches.popitem(last=False)
+        return batch
+
+    def get(self, batch_id: str) -> Optional[Batch]:
+        with self._lock:
+            return self._batches.get(batch_id)
@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import threading
+from typing import Optional
+from .models import Invoice, ExtractionLimits, ExtractionStats, DocumentClassification, DocumentRoute
+from .extractor import extract_invoice, current_rss_mb, sample_rss, check_document_size
+from .classifier import classify_pdf, is_invoice
+
+# Defaults for a long-running API process
+MAX_DOCUMENTS_PER_WORKER = 500
+MAX_WORKER_RSS_MB = 1024.0
+DOCUMENT_TIMEOUT_SECONDS = 120.0
+
+def _worker_loop(conn, limits: dict):
+    limits = ExtractionLimits(**limits)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        doc, inv, stats = _process_document(job, limits)
+        data = inv.model_dump(mode='json') if inv is not None else None
+        conn.send((doc.model_dump(), data, stats.model_dump(), current_rss_mb()))
+
+def _process_document(pdf_path: str, limits: ExtractionLimits):
+    stats = ExtractionStats(worker_pid=os.getpid())
+    doc = None
+    inv = None
+    try:
+        sample_rss(stats)
+        # Size is checked before pdfplumber parses anything, including the first-page pass
+        check_document_size(pdf_path, limits, stats)
+        doc = classify_pdf(pdf_path)
+        stats.error = doc.error
+        if is_invoice(doc):
+            inv = extract_invoice(pdf_path, language=doc.language, limits=limits, stats=stats)
+    except Exception as e:
+        stats.error = f"{type(e).__name__}: {e}"
+        if doc is None:
+            doc = DocumentClassification(source=pdf_path, route=DocumentRoute.UNREADABLE, error=stats.error)
+    return doc, inv, stats
+
+class ExtractionWorker:
+    """Classifies and extracts PDFs in a child process that is recycled after N documents or M MB RSS.
+
+    A PDF that crashes, hangs or bloats the child only costs that child; the
+    next document gets a fresh process.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[ExtractionLimits] = None,
+        max_documents: Optional[int] = MAX_DOCUMENTS_PER_WORKER,
+        max_rss_mb: Optional[float] = MAX_WORKER_RSS_MB,
+        timeout: Optional[float] = DOCUMENT_TIMEOUT_SECONDS,
+    ):
+        self.limits = limits or ExtractionLimits()
+        self.max_documents = max_documents
+        self.max_rss_mb = max_rss_mb
+        self.timeout = timeout
+        self.recycle_count = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._documents = 0
+
+    def _start(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_worker_loop, args=(child_conn, self.limits.model_dump()), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._documents = 0
+
+    def _stop(self, graceful: bool = True):
+        if self._process is None:
+            return
+        if graceful:
+            try:
+                self._conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def _recycle(self, graceful: bool = True):
+        self._stop(graceful=graceful)
+        self.recycle_count += 1
+
+    def _failed(self, pdf_path: str, error: str) -> tuple[DocumentClassification, None, ExtractionStats]:
+        self._recycle(graceful=False)
+        doc = DocumentClassification(source=pdf_path, route=DocumentRoute.UNREADABLE, error=error)
+        return doc, None, ExtractionStats(source=pdf_path, error=error)
+
+    def process(self, pdf_path: str) -> tuple[DocumentClassification, Optional[Invoice], ExtractionStats]:
+        """Classify one PDF and, if it is an invoice, extract it.
+
+        Returns (classification, None, stats) with stats.error set if the document failed.
+        """
+        with self._lock:
+            if self._process is not None and not self._process.is_alive():
+                self._recycle(graceful=False)
+            if self._process is None:
+                self._start()
+
+            try:
+                self._conn.send(pdf_path)
+            except (OSError, BrokenPipeError):
+                return self._failed(pdf_path, "worker process exited before extraction")
+
+            if self.timeout is not None and not self._conn.poll(self.timeout):
+                return self._failed(pdf_path, f"worker timed out after {self.timeout}s")
+
+            try:
+                doc_data, data, stats_data, rss_mb = self._conn.recv()
+            except EOFError:
+                # Child died mid-document (segfault, OOM kill)
+                return self._failed(pdf_path, "worker process exited during extraction")
+
+            doc = DocumentClassification(**doc_data)
+            stats = ExtractionStats(**stats_data)
+            self._documents += 1
+            # A document that tripped the per-document RSS limit leaves a bloated process behind
+            tripped_rss_limit = self.limits.max_rss_mb is not None and stats.rss_growth_mb > self.limits.max_rss_mb
+            if (self.max_documents is not None and self._documents >= self.max_documents) or (
+                self.max_rss_mb is not None and rss_mb > self.max_rss_mb
+            ) or tripped_rss_limit:
+                self._recycle()
+
+            return doc, (Invoice(**data) if data is not None else None), stats
+
+    def close(self):
+        with self._lock:
+            self._stop()
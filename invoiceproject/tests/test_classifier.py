@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from invoice_qc.classifier import classify_text, classify_pdf, record_route
+from invoice_qc.models import DocumentRoute, RoutingSummary
+
+def test_classification():
+    print("Testing first-page classifier...")
+
+    en = classify_text("ACME Ltd\nInvoice No: INV-001\nBill To:\nBuyer Inc\nAmount Due: 100.00")
+    assert en.route == DocumentRoute.INVOICE_EN, f"Expected invoice_en, got {en.route}"
+    assert en.language == "en"
+
+    de = classify_text("ABC GmbH\nRechnung Nr. 4711\nGesamtwert EUR 64,00\nMwSt. 19,00% EUR 12,16")
+    assert de.route == DocumentRoute.INVOICE_DE, f"Expected invoice_de, got {de.route}"
+    assert de.language == "de"
+
+    # Title comes first, so a delivery note that mentions an invoice is still rejected
+    note = classify_text("Delivery Note DN-55\nInvoice to follow")
+    assert note.route == DocumentRoute.NON_INVOICE
+
+    other = classify_text("Meeting agenda for Monday")
+    assert other.route == DocumentRoute.NON_INVOICE
+    print("Text classification passed.")
+
+    if os.path.exists("sample_pdf_1.pdf"):
+        doc = classify_pdf("sample_pdf_1.pdf")
+        assert doc.has_text_layer
+        assert doc.route == DocumentRoute.INVOICE_DE, f"Expected invoice_de, got {doc.route}"
+        print("Sample PDF classification passed.")
+
+def test_routing_summary():
+    routing = RoutingSummary()
+    for text in ["Invoice INV-1 Amount Due: 5.00", "Lieferschein 12"]:
+        doc = classify_text(text)
+        doc.source = text
+        record_route(routing, doc)
+
+    assert routing.total_documents == 2
+    assert routing.route_counts == {"invoice_en": 1, "non_invoice": 1}
+    assert routing.rejected == ["Lieferschein 12"]
+    print("Routing summary passed.")
+
+def test_unreadable_documents_are_counted():
+    junk_path = "not_a_pdf.pdf"
+    with open(junk_path, "wb") as f:
+        f.write(b"this is not a pdf")
+    try:
+        doc = classify_pdf(junk_path)
+    finally:
+        os.remove(junk_path)
+
+    assert doc.route == DocumentRoute.UNREADABLE, f"Expected unreadable, got {doc.route}"
+    assert doc.error
+
+    routing = RoutingSummary()
+    record_route(routing, doc)
+    assert routing.total_documents == 1
+    assert routing.route_counts == {"unreadable": 1}
+    assert routing.unreadable[0].startswith(junk_path + ": ")
+    print("Unreadable document passed.")
+
+if __name__ == "__main__":
+    try:
+        test_classification()
+        test_routing_summary()
+        test_unreadable_documents_are_counted()
+        print("All tests passed!")
+    except Exception as e:
+        print(f"Test failed: {e}")
+        sys.exit(1)
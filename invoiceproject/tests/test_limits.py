@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from invoice_qc.extractor import extract_text_from_pdf, DocumentLimitExceeded
+from invoice_qc.models import ExtractionLimits, ExtractionStats, DocumentRoute
+from invoice_qc.worker import ExtractionWorker
+
+PDF_PATH = "sample_pdf_1.pdf"
+
+def test_document_limits():
+    if not os.path.exists(PDF_PATH):
+        print(f"Warning: {PDF_PATH} not found. Skipping test.")
+        return
+
+    stats = ExtractionStats()
+    text = extract_text_from_pdf(PDF_PATH, stats=stats)
+    assert "Gesamtwert" in text
+    assert stats.pages == 1
+    assert stats.bytes == os.path.getsize(PDF_PATH)
+    assert stats.peak_rss_mb > 0
+    print("Stats collection passed.")
+
+    for limits in [ExtractionLimits(max_bytes=100), ExtractionLimits(max_pages=0)]:
+        try:
+            extract_text_from_pdf(PDF_PATH, limits=limits)
+        except DocumentLimitExceeded:
+            continue
+        assert False, f"Expected DocumentLimitExceeded for {limits}"
+    print("Page and byte limits passed.")
+
+    # The RSS limit applies to what the document adds, not to memory the process already holds
+    baseline = bytearray(64 * 1024 * 1024)
+    stats = ExtractionStats()
+    extract_text_from_pdf(PDF_PATH, limits=ExtractionLimits(max_rss_mb=40), stats=stats)
+    assert stats.peak_rss_mb > 64
+    assert stats.rss_growth_mb < 40
+    del baseline
+    print("RSS growth limit passed.")
+
+def test_worker_recycling():
+    if not os.path.exists(PDF_PATH):
+        print(f"Warning: {PDF_PATH} not found. Skipping test.")
+        return
+
+    worker = ExtractionWorker(max_documents=1)
+    try:
+        doc, inv, stats = worker.process(PDF_PATH)
+        assert doc.route == DocumentRoute.INVOICE_DE
+        assert inv is not None, f"Extraction failed: {stats.error}"
+        assert inv.invoice_number == "AUFNR34343"
+        assert stats.worker_pid is not None and stats.worker_pid != os.getpid()
+        assert worker.recycle_count == 1, "Worker should recycle after max_documents"
+
+        # A limit violation is reported per document and does not kill the worker
+        worker.limits = ExtractionLimits(max_pages=0)
+        doc, inv, stats = worker.process(PDF_PATH)
+        assert inv is None
+        assert "DocumentLimitExceeded" in stats.error
+
+        # Oversized files are rejected in the worker before the first-page pass
+        worker.limits = ExtractionLimits(max_bytes=100)
+        doc, inv, stats = worker.process(PDF_PATH)
+        assert inv is None
+        assert doc.route == DocumentRoute.UNREADABLE and "DocumentLimitExceeded" in doc.error
+        assert doc.char_count == 0
+
+        # Tripping the per-document RSS limit recycles the worker
+        worker.limits = ExtractionLimits(max_rss_mb=-1)
+        worker.max_documents = None
+        recycles = worker.recycle_count
+        doc, inv, stats = worker.process(PDF_PATH)
+        assert inv is None and "grew RSS" in stats.error
+        assert worker.recycle_count == recycles + 1, "Worker should recycle after an RSS trip"
+
+        worker.limits = ExtractionLimits(max_rss_mb=40)
+        pids = set()
+        for _ in range(3):
+            doc, inv, stats = worker.process(PDF_PATH)
+            assert inv is not None, f"Extraction failed: {stats.error}"
+            pids.add(stats.worker_pid)
+        assert len(pids) == 1, "Healthy documents should reuse the same worker"
+    finally:
+        worker.close()
+    print("Worker recycling passed.")
+
+if __name__ == "__main__":
+    try:
+        test_document_limits()
+        test_worker_recycling()
+        print("All tests passed!")
+    except Exception as e:
+        print(f"Test failed: {e}")
+        sys.exit(1)
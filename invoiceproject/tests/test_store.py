@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from invoice_qc.models import Invoice
+from invoice_qc.validator import validate_all
+from invoice_qc.store import Batch, BatchStore
+from datetime import date
+
+def make_batch(n: int) -> Batch:
+    invoices = []
+    for i in range(n):
+        invoices.append(Invoice(
+            invoice_number=f"INV-{i:03d}",
+            invoice_date=date(2024, 1, 1),
+            seller_name="ACME Ltd" if i % 2 == 0 else "Beispiel GmbH",
+            # Every third invoice is missing its buyer
+            buyer_name=None if i % 3 == 0 else "Buyer",
+            gross_total=100.0,
+            raw_text=f"raw text {i}"
+        ))
+    results, summary = validate_all(invoices)
+    return Batch(invoices, results, summary)
+
+def test_pagination():
+    print("Testing batch pagination...")
+    batch = make_batch(25)
+
+    seen = []
+    cursor = None
+    while True:
+        page = batch.page(cursor=cursor, limit=10)
+        assert page.total_matching == 25
+        seen.extend(row.index for row in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == list(range(25)), f"Expected every row once, got {seen}"
+
+    row = batch.page(limit=1).items[0]
+    assert "raw_text" not in row.invoice, "Rows should not carry raw_text"
+    print("Pagination passed.")
+
+def test_filters():
+    batch = make_batch(12)
+
+    invalid = batch.page(is_valid=False, limit=100)
+    assert [r.index for r in invalid.items] == [0, 3, 6, 9]
+
+    missing_buyer = batch.page(error_code="missing_field: buyer_name", limit=2)
+    assert missing_buyer.total_matching == 4
+    assert [r.index for r in missing_buyer.items] == [0, 3]
+    assert missing_buyer.next_cursor == "6"
+
+    acme = batch.page(seller="acme", is_valid=True, limit=100)
+    assert [r.index for r in acme.items] == [2, 4, 8, 10]
+    print("Filters passed.")
+
+def test_store_eviction():
+    store = BatchStore(max_batches=2)
+    first = store.add(make_batch(1))
+    second = store.add(make_batch(1))
+    third = store.add(make_batch(1))
+
+    assert store.get(first.batch_id) is None, "Oldest batch should be evicted"
+    assert store.get(second.batch_id) is second
+    assert store.get(third.batch_id) is third
+    print("Store eviction passed.")
+
+if __name__ == "__main__":
+    try:
+        test_pagination()
+        test_filters()
+        test_store_eviction()
+        print("All tests passed!")
+    except Exception as e:
+        print(f"Test failed: {e}")
+        sys.exit(1)